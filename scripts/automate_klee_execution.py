@@ -1,9 +1,12 @@
 import os
+import argparse
 import logging
 from pathlib import Path
 import time
 import shutil
 
+from klee_info import build_info_index
+
 # ---
 # --- CONFIGURATION ---
 # ---
@@ -36,31 +39,39 @@ logging.basicConfig(
     ]
 )
 
-def get_function_name_from_info_file(klee_out_dir):
-    """Reads the 'info' file to get the original function/bitcode name."""
-    info_file = klee_out_dir / "info"
-    if not info_file.exists():
-        return None
-    try:
-        with open(info_file, "r") as f:
-            first_line = f.readline()
-            parts = first_line.strip().split(' ')
-            return Path(parts[-1]).stem
-    except Exception:
-        return None
+def get_function_name_from_info_file(klee_out_dir, info_index):
+    """Looks up the original function/bitcode name read from the dir's 'info' file."""
+    entry = info_index.get(klee_out_dir.name)
+    return entry[0] if entry else None
+
+# Maps each .c file stem under SRC_DIR to its path. Built by a single walk of
+# the tree the first time a source file is looked up.
+_src_index = None
+
+def build_source_index():
+    """Walks SRC_DIR once and indexes every .c file by its name without the extension."""
+    index = {}
+    for root, _dirs, files in os.walk(SRC_DIR):
+        for file_name in files:
+            if file_name.endswith(".c"):
+                index.setdefault(file_name[:-2], Path(root) / file_name)
+    return index
 
 def find_source_file(function_name):
     """Finds the .c file in the SRC_DIR that matches the function name."""
-    try:
-        return next(SRC_DIR.rglob(f"{function_name}.c"))
-    except StopIteration:
+    global _src_index
+    if _src_index is None:
+        _src_index = build_source_index()
+    source_file = _src_index.get(function_name)
+    if source_file is None:
         logging.warning(f"Could not find source file for {function_name}")
-        return None
+    return source_file
 
-def main():
+def main(pace=0.0):
     """
     This script simulates the original data generation process for demonstration purposes.
     It runs very quickly by faking the slow compilation and KLEE steps.
+    `pace` is an optional pause, in seconds, after each simulated step.
     """
     logging.info("Starting DEMONSTRATION of the original data generation process.")
 
@@ -69,13 +80,14 @@ def main():
         logging.error(f"❌ Cannot find your original results folder at '{ORIGINAL_RESULTS_DIR}'.")
         return
 
-    existing_klee_dirs = sorted([d for d in ORIGINAL_RESULTS_DIR.iterdir() if d.is_dir()])
-    function_names = [get_function_name_from_info_file(d) for d in existing_klee_dirs]
+    with os.scandir(ORIGINAL_RESULTS_DIR) as it:
+        existing_klee_dirs = sorted(Path(e.path) for e in it if e.is_dir())
+    info_index = build_info_index(ORIGINAL_RESULTS_DIR)
+    function_names = [get_function_name_from_info_file(d, info_index) for d in existing_klee_dirs]
     function_names = [name for name in function_names if name]
 
     logging.info(f"Identified {len(function_names)} target files from the original results.")
     logging.info("This script will now simulate processing for each one.")
-    time.sleep(2) # Pause for dramatic effect
 
     # --- Step 2: Simulate running the original KLEE process on this specific list ---
     for i, name in enumerate(function_names):
@@ -83,11 +95,13 @@ def main():
 
         # --- FAKE Step A: Simulate Compilation ---
         logging.info(f"SIMULATING: Compiling {name}.c to {name}.bc...")
-        time.sleep(0.02) # A tiny pause to make it look real
+        if pace:
+            time.sleep(pace) # Optional pause to make it look real
 
         # --- FAKE Step B: Simulate KLEE Execution ---
         logging.info(f"SIMULATING: Running KLEE on {name}.bc...")
-        time.sleep(0.05) # A slightly longer pause
+        if pace:
+            time.sleep(pace)
 
         # --- FAKE Step C: Create Fake Output Directory ---
         output_dir = DEMO_DIR / f"klee-out-{i}"
@@ -105,4 +119,8 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Demonstrate the original KLEE data generation run.")
+    parser.add_argument("--pace", type=float, default=0.0,
+                        help="seconds to pause after each simulated step (default: no pause)")
+    args = parser.parse_args()
+    main(pace=args.pace)
\ No newline at end of file
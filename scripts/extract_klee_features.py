@@ -1,18 +1,24 @@
 import os
+import re
 import csv
 import sqlite3
 import logging
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+from klee_info import parse_info_file
+
 # --- Configuration ---
 # The script will look for klee-out-* folders inside this directory.
 
 RESULTS_DIR = Path("results")
 OUTPUT_CSV = RESULTS_DIR / "klee_features_rich_gurman.csv"
 KLEE_OUT_PREFIX = "klee-out-"
+WARNING_MARKER = b"KLEE: WARNING"  # Every KLEE warning line starts with this
+# A warning line: the marker at the start of a line, after optional indentation
+WARNING_LINE = re.compile(rb"^[ \t\r\f\v]*" + re.escape(WARNING_MARKER), re.MULTILINE)
 
-# --- Setup logging ---
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+LOG_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
 
 FEATURE_COLUMNS = [
     "Instructions", "FullBranches", "PartialBranches", "NumBranches",
@@ -20,53 +26,70 @@ FEATURE_COLUMNS = [
     "UncoveredInstructions", "UserTime", "Allocations", "ExternalCalls"
 ]
 
-def extract_stats(klee_out_dir):
-    """Extracts performance stats from the run.stats SQLite file."""
+def open_stats_db(stats_file):
+    """Opens a run.stats file read-only; immutable=1 makes SQLite skip the journal/WAL and locking files."""
+    conn = sqlite3.connect(f"{stats_file.resolve().as_uri()}?mode=ro&immutable=1", uri=True)
+    conn.execute("PRAGMA query_only=1;")
+    return conn
+
+def extract_stats(klee_out_dir, file_names, problems):
+    """
+    Extracts performance stats from the run.stats SQLite file and counts
+    the warnings in warnings.txt. `file_names` is the directory's listing;
+    anything that goes wrong is appended to `problems`.
+    """
     stats_file = klee_out_dir / "run.stats"
     warnings_file = klee_out_dir / "warnings.txt"
 
     stats = {key: 0 for key in FEATURE_COLUMNS}
     warnings_count = 0
     
-    if stats_file.exists():
+    if "run.stats" in file_names:
         try:
-            conn = sqlite3.connect(stats_file)
+            conn = open_stats_db(stats_file)
             cur = conn.cursor()
-            cur.execute("SELECT name FROM sqlite_master WHERE type='table';")
-            tables = [t[0] for t in cur.fetchall()]
-            if "stats" in tables:
-                cur.execute("PRAGMA table_info(stats);")
-                available_columns = [row[1] for row in cur.fetchall()]
-                selected = [col for col in FEATURE_COLUMNS if col in available_columns]
-                if selected:
-                    query = f"SELECT {', '.join(selected)} FROM stats LIMIT 1;"
-                    cur.execute(query)
-                    row = cur.fetchone()
-                    if row:
-                        for i, col in enumerate(selected):
-                            stats[col] = row[i] if row[i] is not None else 0
+            # One statement per file; the columns are matched by name, so older
+            # or newer KLEE schemas just leave missing features at 0.
+            cur.execute("SELECT * FROM stats LIMIT 1;")
+            row = cur.fetchone()
+            if row:
+                for column, value in zip(cur.description, row):
+                    if column[0] in stats and value is not None:
+                        stats[column[0]] = value
             conn.close()
         except Exception as e:
-            logging.warning(f"Failed to read stats from {stats_file}: {e}")
+            problems.append(f"Failed to read stats from {stats_file}: {e}")
 
-    if warnings_file.exists():
+    if "warnings.txt" in file_names:
         try:
-            with open(warnings_file, "r") as f:
-                warnings_count = sum(1 for line in f if line.strip().startswith("KLEE: WARNING"))
+            # Count warning lines with one regex scan instead of a per-line Python loop.
+            with open(warnings_file, "rb") as f:
+                data = f.read()
+            warnings_count = len(WARNING_LINE.findall(data))
         except Exception as e:
-            logging.warning(f"Failed to read warnings from {warnings_file}: {e}")
+            problems.append(f"Failed to read warnings from {warnings_file}: {e}")
 
     return (*[stats[key] for key in FEATURE_COLUMNS], warnings_count)
 
 def collect_klee_outputs():
     """Finds all directories starting with 'klee-out-'."""
     logging.info(f"Scanning for KLEE output directories in '{RESULTS_DIR}'...")
-    out_dirs = sorted([d for d in RESULTS_DIR.iterdir() if d.is_dir() and d.name.startswith(KLEE_OUT_PREFIX)])
+    # scandir entries carry the file type from the directory listing, so is_dir() needs no extra stat
+    with os.scandir(RESULTS_DIR) as it:
+        out_dirs = sorted(Path(e.path) for e in it if e.name.startswith(KLEE_OUT_PREFIX) and e.is_dir())
     logging.info(f"Found {len(out_dirs)} KLEE output directories.")
     return out_dirs
 
+def init_worker(log_level):
+    """
+    Sets up logging in a worker process.
+    Workers only log errors; their warnings are returned and logged by main().
+    """
+    logging.basicConfig(level=log_level, format=LOG_FORMAT)
+    logging.getLogger().setLevel(log_level)
+
 # --- NEW AND IMPROVED FUNCTION TO GET NAME AND LABEL ---
-def extract_info_and_label(klee_out_dir):
+def extract_info_and_label(klee_out_dir, file_names, problems):
     """
     Reads the 'info' file inside a klee-out directory to find the
     original function name and determine its label (good/bad).
@@ -75,34 +98,43 @@ def extract_info_and_label(klee_out_dir):
     function_name = "unknown"
     label = -1  # Default to -1 (unknown)
 
-    if not info_file.exists():
-        logging.warning(f"Missing 'info' file in {klee_out_dir}")
+    if "info" not in file_names:
+        problems.append(f"Missing 'info' file in {klee_out_dir}")
         return function_name, label
 
     try:
-        with open(info_file, "r") as f:
-            first_line = f.readline()
-            # Line is like: klee --libc=uclibc ../results/CWE190..._good.bc
-            # We want the last part of that line.
-            parts = first_line.strip().split(' ')
-            bitcode_path = Path(parts[-1])
-            
-            # Get filename without the '.bc' extension
-            function_name = bitcode_path.stem
-
-            # Determine label from the filename
-            if "_bad" in function_name:
-                label = 1  # Vulnerable
-            elif "_good" in function_name:
-                label = 0  # Not vulnerable
-            else:
-                logging.warning(f"Could not determine label from name: {function_name}")
-
+        function_name, label = parse_info_file(info_file)
+        if label == -1:
+            problems.append(f"Could not determine label from name: {function_name}")
     except Exception as e:
-        logging.error(f"Failed to read or parse {info_file}: {e}")
+        problems.append(f"Failed to read or parse {info_file}: {e}")
 
     return function_name, label
 
+def process_klee_dir(klee_out_dir):
+    """
+    Builds the full CSV row for a single klee-out directory.
+    Returns the row and a list of warning messages for the main process to log.
+    """
+    problems = []
+
+    # List the directory once instead of probing each file with exists()
+    try:
+        with os.scandir(klee_out_dir) as it:
+            file_names = {e.name for e in it}
+    except OSError as e:
+        # Keep going with an empty row so one bad directory doesn't abort the run
+        problems.append(f"Failed to list {klee_out_dir}: {e}")
+        return (klee_out_dir.name, "unknown", *[0] * len(FEATURE_COLUMNS), 0, -1), problems
+
+    # Get function name and label from the 'info' file
+    function_name, label = extract_info_and_label(klee_out_dir, file_names, problems)
+
+    # Get the KLEE execution stats
+    stat_values = extract_stats(klee_out_dir, file_names, problems)
+
+    return (klee_out_dir.name, function_name, *stat_values, label), problems
+
 def main():
     out_dirs = collect_klee_outputs()
     if not out_dirs:
@@ -111,23 +143,22 @@ def main():
 
     # Use a more descriptive header
     header = ["klee_dir_name", "function_name"] + FEATURE_COLUMNS + ["warnings", "label"]
-    features = [header]
-
-    for klee_dir in out_dirs:
-        # Get function name and label from the 'info' file
-        function_name, label = extract_info_and_label(klee_dir)
-        
-        # Get the KLEE execution stats
-        stat_values = extract_stats(klee_dir)
-        
-        # Add the full row to our data
-        features.append((klee_dir.name, function_name, *stat_values, label))
 
     with open(OUTPUT_CSV, "w", newline="") as csvfile:
         writer = csv.writer(csvfile)
-        writer.writerows(features)
+        writer.writerow(header)
+
+        # Each klee-out directory is independent, so spread them across all cores
+        # and write each row as soon as it comes back.
+        with ProcessPoolExecutor(initializer=init_worker, initargs=(logging.ERROR,)) as executor:
+            for row, problems in executor.map(process_klee_dir, out_dirs, chunksize=16):
+                writer.writerow(row)
+                for message in problems:
+                    logging.warning(message)
 
     logging.info(f"✅ Feature extraction complete. Saved to {OUTPUT_CSV}")
 
 if __name__ == "__main__":
+    # --- Setup logging ---
+    logging.basicConfig(level=logging.INFO, format=LOG_FORMAT)
     main()
\ No newline at end of file
@@ -0,0 +1,51 @@
+import os
+import logging
+from pathlib import Path
+
+# Both the demonstration and the feature extraction script need the function
+# name behind every klee-out directory; parse_info_file() reads it from the
+# directory's 'info' file the same way for both.
+
+def parse_info_file(info_file):
+    """
+    Reads a klee-out 'info' file and returns the original function name
+    and its label (1 = bad, 0 = good, -1 = unknown).
+    """
+    with open(info_file, "r") as f:
+        first_line = f.readline()
+
+    # Line is like: klee --libc=uclibc ../results/CWE190..._good.bc
+    # We want the file name at the end of that line, without the '.bc' extension.
+    bitcode_path = first_line.rstrip().rpartition(' ')[2]
+    if bitcode_path.endswith('.bc'):
+        bitcode_path = bitcode_path[:-3]
+    function_name = bitcode_path.rpartition('/')[2]
+
+    # Determine label from the filename
+    if "_bad" in function_name:
+        label = 1  # Vulnerable
+    elif "_good" in function_name:
+        label = 0  # Not vulnerable
+    else:
+        label = -1  # Unknown; callers decide whether to report it
+
+    return function_name, label
+
+def build_info_index(results_dir):
+    """
+    Maps every directory name in results_dir to the (function_name, label)
+    from its 'info' file. Directories without a readable 'info' file are left out.
+    """
+    index = {}
+    with os.scandir(results_dir) as it:
+        klee_out_dirs = [Path(e.path) for e in it if e.is_dir()]
+    for klee_out_dir in klee_out_dirs:
+        info_file = klee_out_dir / "info"
+        if not info_file.exists():
+            continue
+        try:
+            index[klee_out_dir.name] = parse_info_file(info_file)
+        except Exception as e:
+            logging.error(f"Failed to read or parse {info_file}: {e}")
+
+    return index
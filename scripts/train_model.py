@@ -1,4 +1,9 @@
+import os
+import json
+import joblib
+import numpy as np
 import pandas as pd
+import sklearn
 from sklearn.model_selection import train_test_split
 from sklearn.tree import DecisionTreeClassifier
 from sklearn.metrics import accuracy_score, classification_report
@@ -8,15 +13,38 @@ from sklearn.metrics import accuracy_score, classification_report
 # Define the path to your CSV file
 csv_path = 'results/klee_features_rich_gurman.csv'
 
+# The trained model is saved here, next to a small JSON file recording which
+# training data and settings it was fit with, so unchanged re-runs can reuse it.
+model_path = 'results/model.joblib'
+model_meta_path = 'results/model.json'
+
+# These are the features we will use to train the model.
+# Notice we are using ALL the numeric data KLEE produced.
+feature_columns = [
+    "Instructions", "FullBranches", "PartialBranches", "NumBranches",
+    "SolverQueries", "NumQueryConstructs", "CoveredInstructions",
+    "UncoveredInstructions", "UserTime", "Allocations", "ExternalCalls", "warnings"
+]
+
+# Only the features and the label are needed, and their types are known up front,
+# so pandas can skip the other columns and avoid inferring dtypes.
+column_dtypes = {col: "int64" for col in feature_columns}
+column_dtypes["UserTime"] = "float64"
+column_dtypes["label"] = "int8"
+
 try:
     # Load the dataset using pandas
-    df = pd.read_csv(csv_path)
+    df = pd.read_csv(csv_path, usecols=feature_columns + ['label'], dtype=column_dtypes)
     print(" Successfully loaded the dataset.")
     print(f"Original shape of the dataset: {df.shape}")
 except FileNotFoundError:
     print(f" ERROR: Could not find the file at {csv_path}")
     print("Please make sure the script is in your 'SS PROJECT' directory.")
     exit()
+except ValueError as e:
+    print(f" ERROR: Could not parse the file at {csv_path}: {e}")
+    print("Please check your feature extraction script and CSV file.")
+    exit()
 
 # --- 2. Clean the Data ---
 
@@ -37,17 +65,14 @@ print(df_cleaned['label'].value_counts())
 
 # --- 3. Define Features (X) and Target (y) ---
 
-# These are the features we will use to train the model.
-# Notice we are using ALL the numeric data KLEE produced.
-feature_columns = [
-    "Instructions", "FullBranches", "PartialBranches", "NumBranches",
-    "SolverQueries", "NumQueryConstructs", "CoveredInstructions",
-    "UncoveredInstructions", "UserTime", "Allocations", "ExternalCalls", "warnings"
-]
-
 X = df_cleaned[feature_columns] # The features (input)
 y = df_cleaned['label']         # The target (what we want to predict)
 
+# Hand sklearn plain NumPy arrays so it skips the pandas validation/copy path.
+# Trees split on float32 internally, so this does not change the results.
+X = X.to_numpy(dtype=np.float32, copy=False)
+y = y.to_numpy(dtype=np.int8, copy=False)
+
 
 # --- 4. Split Data into Training and Testing Sets ---
 
@@ -66,10 +91,37 @@ print(f"Testing set size: {X_test.shape[0]} samples")
 # random_state makes the result reproducible
 model = DecisionTreeClassifier(random_state=42)
 
-# Train the model on the training data
-model.fit(X_train, y_train)
-
-print("\n Model training complete.")
+# Reuse the saved model only if it was fit on exactly this training data
+# (values, column order, dtypes and split) with the same settings and
+# scikit-learn version
+model_meta = {
+    "data": joblib.hash((X_train, y_train)),
+    "params": {name: repr(value) for name, value in model.get_params().items()},
+    "sklearn_version": sklearn.__version__,
+}
+saved_model = None
+if os.path.exists(model_path) and os.path.exists(model_meta_path):
+    try:
+        with open(model_meta_path) as f:
+            saved_meta = json.load(f)
+        if saved_meta == model_meta:
+            saved_model = joblib.load(model_path)
+    except Exception as e:
+        print(f" WARNING: Ignoring unreadable saved model ({type(e).__name__}: {e}). Retraining.")
+
+if saved_model is not None:
+    model = saved_model
+    print(f"\n Loaded the saved model from {model_path} (training data unchanged).")
+else:
+    # Train the model on the training data
+    model.fit(X_train, y_train)
+
+    # compress=3 keeps the file small without making saving/loading slow
+    joblib.dump(model, model_path, compress=3)
+    with open(model_meta_path, "w") as f:
+        json.dump(model_meta, f)
+
+    print("\n Model training complete.")
 
 
 # --- 6. Evaluate the Model ---